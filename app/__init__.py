@@ -1,17 +1,49 @@
+import hashlib
 import os
-from flask import Flask, jsonify
-from flask_cors import CORS
-from app.models import db
-from app.routes import api
-from app.config import config
+import orjson
+from types import MappingProxyType
+from flask import Flask, Response, request
+from werkzeug.middleware.proxy_fix import ProxyFix
+from app.json_provider import OrjsonProvider
+from app.middleware import FastNotFound, compress_response
+
+# Error bodies never change, so serialize them once at import time.
+# Handlers still wrap them in a fresh Response: after_request hooks (CORS,
+# rate-limit headers) mutate the response, so a shared instance would leak
+# headers between requests.
+_ERR_404 = orjson.dumps({'success': False, 'error': 'Resource not found'})
+_ERR_429 = orjson.dumps({'success': False, 'error': 'Rate limit exceeded'})
+_ERR_500 = orjson.dumps({'success': False, 'error': 'Internal server error'})
+
+# The index payload is static too; its body and ETag are built once per process.
+# The read-only source mapping keeps the payload from being mutated after import.
+_INDEX_PAYLOAD = MappingProxyType({
+    'message': 'Flask Todo API',
+    'version': '1.0.0',
+    'endpoints': MappingProxyType({
+        'health': '/api/health',
+        'todos': '/api/todos'
+    })
+})
+_INDEX_BODY = orjson.dumps(_INDEX_PAYLOAD, default=dict)
+_INDEX_ETAG = hashlib.blake2b(_INDEX_BODY, digest_size=8).hexdigest()
 
 
 def create_app(config_name=None):
     """Application factory pattern"""
+    # Extensions, models and routes pull in SQLAlchemy, flask-limiter and
+    # flask-cors; importing them here keeps `import app` cheap.
+    from flask_cors import CORS
+    from app.config import config
+    from app.limiter import limiter
+    from app.models import db
+    from app.routes import api
+
     if config_name is None:
         config_name = os.getenv('FLASK_ENV', 'development')
 
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     app.config.from_object(config[config_name])
     config[config_name].init_app(app)
 
@@ -32,44 +64,44 @@ def create_app(config_name=None):
     })
 
     db.init_app(app)
+    limiter.init_app(app)
     app.register_blueprint(api, url_prefix='/api')
+    app.after_request(compress_response)
 
     @app.route('/')
+    @limiter.exempt
     def index():
-        return jsonify({
-            'message': 'Flask Todo API',
-            'version': '1.0.0',
-            'endpoints': {
-                'health': '/api/health',
-                'todos': '/api/todos'
-            }
-        })
+        response = Response(_INDEX_BODY, mimetype='application/json')
+        response.set_etag(_INDEX_ETAG)
+        return response.make_conditional(request)
 
     @app.errorhandler(404)
     def not_found(error):
-        return jsonify({
-            'success': False,
-            'error': 'Resource not found'
-        }), 404
+        return Response(_ERR_404, status=404, mimetype='application/json')
 
-    @app.errorhandler(500)
-    def internal_error(error):
-        db.session.rollback()
-        return jsonify({
-            'success': False,
-            'error': 'Internal server error'
-        }), 500
+    @app.errorhandler(429)
+    def rate_limited(error):
+        return Response(_ERR_429, status=429, mimetype='application/json')
 
+    # No rollback here: Flask-SQLAlchemy removes the session when the app
+    # context tears down, which rolls back any transaction left open.
+    @app.errorhandler(500)
     @app.errorhandler(Exception)
     def handle_exception(error):
         """Handle all unhandled exceptions"""
-        db.session.rollback()
-        return jsonify({
-            'success': False,
-            'error': 'Internal server error'
-        }), 500
-
-    with app.app_context():
-        db.create_all()
+        return Response(_ERR_500, status=500, mimetype='application/json')
+
+    # Reject unrouted paths before Flask dispatch
+    app.wsgi_app = FastNotFound(app.wsgi_app, app.url_map, _ERR_404)
+
+    # Behind a reverse proxy REMOTE_ADDR is the proxy, so every client would
+    # share one rate-limit bucket. Only the configured number of hops is
+    # trusted; anything further left in X-Forwarded-For can be spoofed.
+    if app.config['PROXY_FIX_X_FOR']:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+
+    if app.config.get('AUTO_CREATE_TABLES', False):
+        with app.app_context():
+            db.create_all()
 
     return app
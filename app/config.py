@@ -1,6 +1,8 @@
 import os
+from types import MappingProxyType
 
 from dotenv import load_dotenv
+from sqlalchemy.pool import StaticPool
 
 load_dotenv()
 
@@ -10,6 +12,26 @@ class Config:
 
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Run db.create_all() at startup; each environment opts in
+    AUTO_CREATE_TABLES = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+
+    # Rate limiting is opt-in; share counters across workers via RATELIMIT_STORAGE_URI (e.g. redis://)
+    RATELIMIT_ENABLED = os.getenv("RATELIMIT_ENABLED", "false").lower() == "true"
+    RATELIMIT_STORAGE_URI = os.getenv("RATELIMIT_STORAGE_URI", "memory://")
+    RATELIMIT_STRATEGY = "moving-window"
+    # Reverse proxies in front of the app; their X-Forwarded-For entries become REMOTE_ADDR
+    PROXY_FIX_X_FOR = 0
+
+    # gzip JSON responses of at least COMPRESS_MIN_SIZE bytes; level 1 favours CPU over ratio
+    COMPRESS_MIN_SIZE = 500
+    COMPRESS_LEVEL = 1
 
     @staticmethod
     def init_app(app):
@@ -20,6 +42,7 @@ class DevelopmentConfig(Config):
     """Development configuration"""
 
     DEBUG = True
+    AUTO_CREATE_TABLES = True
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/todo_dev")
 
 
@@ -27,8 +50,15 @@ class TestingConfig(Config):
     """Testing configuration"""
 
     TESTING = True
+    AUTO_CREATE_TABLES = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    # In-memory SQLite lives on a single connection, so share it instead of pooling
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "poolclass": StaticPool,
+        "connect_args": {"check_same_thread": False},
+    }
     WTF_CSRF_ENABLED = False
+    RATELIMIT_ENABLED = False
 
 
 class ProductionConfig(Config):
@@ -36,17 +66,35 @@ class ProductionConfig(Config):
 
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_RECORD_QUERIES = False
+    # No migrations exist yet, so a fresh deploy creates its tables on startup
+    AUTO_CREATE_TABLES = os.getenv("AUTO_CREATE_TABLES", "true").lower() == "true"
+    # Keep serving requests if the rate-limit storage is unreachable
+    RATELIMIT_SWALLOW_ERRORS = True
+    # Render and Railway route traffic through one proxy hop
+    PROXY_FIX_X_FOR = int(os.getenv("PROXY_FIX_X_FOR", "1"))
+
+    @staticmethod
+    def validate_env():
+        """Check the environment variables production cannot run without"""
+        assert os.getenv("DATABASE_URL"), "DATABASE_URL must be set in production"
 
     @classmethod
     def init_app(cls, app):
         Config.init_app(app)
         # Production-specific initialization
-        assert os.getenv("DATABASE_URL"), "DATABASE_URL must be set in production"
-
-
-config = {
-    "development": DevelopmentConfig,
-    "testing": TestingConfig,
-    "production": ProductionConfig,
-    "default": DevelopmentConfig,
-}
+        cls.validate_env()
+        # Per-query signal/recording overhead is only useful while debugging
+        assert not app.config["SQLALCHEMY_TRACK_MODIFICATIONS"], "SQLALCHEMY_TRACK_MODIFICATIONS must be off"
+        assert not app.config["SQLALCHEMY_RECORD_QUERIES"], "SQLALCHEMY_RECORD_QUERIES must be off"
+
+
+config = MappingProxyType(
+    {
+        "development": DevelopmentConfig,
+        "testing": TestingConfig,
+        "production": ProductionConfig,
+        "default": DevelopmentConfig,
+    }
+)
@@ -0,0 +1,16 @@
+from flask import request
+from flask_limiter import Limiter
+
+
+def _remote_addr():
+    """Rate-limit key: the client address from the WSGI environ (rewritten by ProxyFix behind a proxy)"""
+    return request.environ.get("REMOTE_ADDR") or "127.0.0.1"
+
+
+# Storage backend and strategy are read from app.config (RATELIMIT_*) in init_app.
+# Probe endpoints (/ and /api/health) opt out with @limiter.exempt.
+limiter = Limiter(
+    key_func=_remote_addr,
+    # One combined group: flask-limiter re-parses each group's string per check
+    default_limits=["200 per day;50 per hour"],
+)
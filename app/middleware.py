@@ -0,0 +1,58 @@
+import gzip
+
+from flask import current_app, request
+
+
+def _first_segment(path):
+    """First segment of a slash-rooted path; None for anything else (e.g. ``*``)"""
+    return path[1:].split("/", 1)[0] if path.startswith("/") else None
+
+
+class FastNotFound:
+    """WSGI middleware answering 404 for paths outside every routed prefix.
+
+    Bot scans (``/wp-login.php``, ``/.env``, ...) are rejected before Flask
+    builds a request context or matches the URL map. Prefixes are the first
+    path segments of the app's URL rules, collected on the first request so
+    routes registered after the factory returns are included.
+    """
+
+    def __init__(self, wsgi_app, url_map, body):
+        self.wsgi_app = wsgi_app
+        self.url_map = url_map
+        self.body = body
+        self.headers = [
+            ("Content-Type", "application/json"),
+            ("Content-Length", str(len(body))),
+        ]
+        self.prefixes = None
+
+    def __call__(self, environ, start_response):
+        if self.prefixes is None:
+            self.prefixes = frozenset(_first_segment(rule.rule) for rule in self.url_map.iter_rules())
+
+        path = environ.get("PATH_INFO") or "/"
+        if _first_segment(path) not in self.prefixes:
+            start_response("404 NOT FOUND", list(self.headers))
+            return [self.body]
+        return self.wsgi_app(environ, start_response)
+
+
+def compress_response(response):
+    """after_request hook gzip-compressing JSON bodies large enough to benefit"""
+    config = current_app.config
+    if (
+        response.direct_passthrough
+        or response.mimetype != "application/json"
+        or "Content-Encoding" in response.headers
+        or (response.content_length or 0) < config["COMPRESS_MIN_SIZE"]
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if not request.accept_encodings["gzip"]:
+        return response
+
+    response.set_data(gzip.compress(response.get_data(), compresslevel=config["COMPRESS_LEVEL"]))
+    response.headers["Content-Encoding"] = "gzip"
+    return response
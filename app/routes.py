@@ -1,28 +1,33 @@
-from flask import Blueprint, jsonify, request
+import orjson
+from flask import Blueprint, Response, jsonify, request
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.limiter import limiter
 from app.models import Todo, db
 
 api = Blueprint("api", __name__)
 
+# Health is the highest-traffic route, so its bodies are serialized once
+_HEALTHY = orjson.dumps({"status": "healthy", "database": "connected"})
+_UNHEALTHY = orjson.dumps(
+    {
+        "status": "unhealthy",
+        "database": "disconnected",
+        "error": "Database connection failed",
+    }
+)
+_NO_STORE = {"Cache-Control": "no-store"}
+
 
 @api.route("/health", methods=["GET"])
+@limiter.exempt
 def health_check():
     """Health check endpoint for monitoring"""
     try:
         db.session.execute(db.text("SELECT 1"))
-        return jsonify({"status": "healthy", "database": "connected"}), 200
+        return Response(_HEALTHY, status=200, mimetype="application/json", headers=_NO_STORE)
     except Exception:
-        return (
-            jsonify(
-                {
-                    "status": "unhealthy",
-                    "database": "disconnected",
-                    "error": "Database connection failed",
-                }
-            ),
-            503,
-        )
+        return Response(_UNHEALTHY, status=503, mimetype="application/json", headers=_NO_STORE)
 
 
 @api.route("/todos", methods=["GET"])
@@ -0,0 +1,6 @@
+from asgiref.wsgi import WsgiToAsgi
+
+from run import app
+
+# ASGI entry point for uvicorn/hypercorn; views still run in a worker thread
+asgi_app = WsgiToAsgi(app)
@@ -0,0 +1,22 @@
+"""Gunicorn configuration"""
+
+bind = "0.0.0.0:5000"
+workers = 4
+# Threaded workers overlap requests waiting on the database
+worker_class = "gthread"
+threads = 4
+timeout = 120
+
+# Build the app once in the master and fork it, so workers share the
+# imported modules and URL map through copy-on-write memory
+preload_app = True
+
+
+def post_fork(server, worker):
+    """Drop pooled DB connections inherited from the master process"""
+    from app.models import db
+    from run import app
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
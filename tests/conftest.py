@@ -0,0 +1,128 @@
+import hashlib
+from types import MappingProxyType, SimpleNamespace
+
+import pytest
+
+from app import create_app as _create_app
+from app.config import Config, DevelopmentConfig, ProductionConfig, TestingConfig
+
+# Files whose contents decide the outcome of tests/test_config.py. The
+# production app test builds the whole app, so every app module counts.
+_CONFIG_TEST_INPUTS = (
+    "app/*.py",
+    "tests/__init__.py",
+    "tests/conftest.py",
+    "tests/test_config.py",
+    "pytest.ini",
+)
+_CONFIG_TEST_FILE = "test_config.py"
+_CONFIG_HASH_KEY = "config_tests/inputs_hash"
+
+# Config tests seen by this process: collected node ids, passed node ids and
+# whether the run still covers the whole file with no failures
+_config_run = SimpleNamespace(collected=frozenset(), passed=set(), complete=True)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--skip-unchanged-config",
+        action="store_true",
+        default=False,
+        help="skip tests/test_config.py when its inputs are unchanged since the last passing run",
+    )
+
+
+def _config_inputs_hash(rootpath):
+    digest = hashlib.blake2b()
+    for pattern in _CONFIG_TEST_INPUTS:
+        for path in sorted(rootpath.glob(pattern)):
+            digest.update(path.relative_to(rootpath).as_posix().encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _is_config_test(nodeid):
+    return nodeid.split("::", 1)[0].endswith(_CONFIG_TEST_FILE)
+
+
+def _skip_unchanged_config(config):
+    return config.getoption("--skip-unchanged-config") and config.cache is not None
+
+
+def pytest_collection_modifyitems(config, items):
+    if not _skip_unchanged_config(config):
+        return
+    if config.cache.get(_CONFIG_HASH_KEY, None) != _config_inputs_hash(config.rootpath):
+        return
+
+    skip = pytest.mark.skip(reason="config unchanged since last passing run")
+    for item in items:
+        if item.path.name == _CONFIG_TEST_FILE:
+            item.add_marker(skip)
+
+
+def pytest_deselected(items):
+    if any(_is_config_test(item.nodeid) for item in items):
+        _config_run.complete = False
+
+
+def pytest_collection_finish(session):
+    _config_run.collected = frozenset(item.nodeid for item in session.items if _is_config_test(item.nodeid))
+    # Selecting single tests (test_config.py::name) leaves the rest uncollected
+    if any("::" in arg and _is_config_test(arg) for arg in session.config.args):
+        _config_run.complete = False
+
+
+def pytest_runtest_logreport(report):
+    if not _is_config_test(report.nodeid):
+        return
+    if report.failed:
+        _config_run.complete = False
+    elif report.when == "call" and report.passed:
+        _config_run.passed.add(report.nodeid)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    # Only record the inputs once every config test ran here and passed. Under
+    # xdist the worker running the env_mutating group sees them all; the
+    # controller collects nothing and never writes.
+    if (
+        _skip_unchanged_config(session.config)
+        and _config_run.complete
+        and _config_run.collected
+        and _config_run.passed == _config_run.collected
+    ):
+        session.config.cache.set(_CONFIG_HASH_KEY, _config_inputs_hash(session.config.rootpath))
+
+
+def _settings(cls):
+    """Read-only copy of a config class's settings, inherited ones included"""
+    return MappingProxyType({name: getattr(cls, name) for name in dir(cls) if name.isupper()})
+
+
+@pytest.fixture(scope="session")
+def cfg_snapshot():
+    """Config class settings captured once per test session"""
+    return SimpleNamespace(
+        base=_settings(Config),
+        dev=_settings(DevelopmentConfig),
+        test=_settings(TestingConfig),
+        prod=_settings(ProductionConfig),
+    )
+
+
+@pytest.fixture(scope="session")
+def production_app():
+    """
+    Production app built once per test session.
+    ProductionConfig reads DATABASE_URL at import, so the class attribute is
+    overridden alongside the env var. AUTO_CREATE_TABLES is switched off so
+    building the app never connects to the database. The app copies its
+    settings when built, so the patches are undone before it is handed out.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("DATABASE_URL", "postgresql+psycopg2://test")
+        mp.setattr(ProductionConfig, "SQLALCHEMY_DATABASE_URI", "postgresql+psycopg2://test")
+        mp.setattr(ProductionConfig, "AUTO_CREATE_TABLES", False)
+        app = _create_app("production")
+    yield app
@@ -1,20 +1,58 @@
+import gzip
+import json
 import pytest
+from decimal import Decimal
 from unittest.mock import patch
+from sqlalchemy import event
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import scoped_session, sessionmaker
 from app import create_app
 from app.models import db, Todo
+from app.config import TestingConfig
+from app.json_provider import OrjsonProvider
 
 
-@pytest.fixture
-def app():
-    """Create and configure a test app instance"""
+def _enable_sqlite_savepoints(engine):
+    """Let pysqlite honour BEGIN/SAVEPOINT so per-test rollbacks work"""
+
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session")
+def session_app():
+    """Create the test app and schema once per test session"""
     app = create_app("testing")
 
     with app.app_context():
+        # Reconnect so the listeners apply to the in-memory database
+        db.engine.dispose()
+        _enable_sqlite_savepoints(db.engine)
         db.create_all()
-        yield app
+    return app
+
+
+@pytest.fixture
+def app(session_app):
+    """Run each test inside a transaction that is rolled back afterwards"""
+    with session_app.app_context():
+        connection = db.engine.connect()
+        trans = connection.begin()
+        original_session = db.session
+        # Commits in routes release a SAVEPOINT instead of ending the outer transaction
+        db.session = scoped_session(sessionmaker(bind=connection, join_transaction_mode="create_savepoint"))
+
+        yield session_app
+
         db.session.remove()
-        db.drop_all()
+        db.session = original_session
+        trans.rollback()
+        connection.close()
 
 
 @pytest.fixture
@@ -39,6 +77,7 @@ class TestHealthCheck:
         data = response.get_json()
         assert data["status"] == "healthy"
         assert data["database"] == "connected"
+        assert response.headers["Cache-Control"] == "no-store"
 
     @patch("app.routes.db.session.execute")
     def test_health_endpoint_database_error(self, mock_execute, client):
@@ -311,6 +350,16 @@ class TestAppFactory:
         assert "version" in data
         assert "endpoints" in data
 
+    def test_root_endpoint_etag(self, client):
+        """Test root endpoint returns 304 when the ETag still matches"""
+        response = client.get("/")
+        etag = response.headers["ETag"]
+        assert etag
+
+        cached = client.get("/", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.data == b""
+
     def test_404_error_handler(self, client):
         """Test 404 error handler"""
         response = client.get("/nonexistent-endpoint")
@@ -319,8 +368,42 @@ class TestAppFactory:
         assert data["success"] is False
         assert "error" in data
 
-    def test_exception_handler(self, app):
+    def test_unrouted_prefix_short_circuits(self, client):
+        """Test paths outside every route prefix get a JSON 404 before Flask dispatch"""
+        response = client.get("/wp-login.php", headers={"Origin": "https://petchauisui.github.io"})
+        assert response.status_code == 404
+        assert response.get_json() == {"success": False, "error": "Resource not found"}
+        # Flask's after_request hooks (CORS) never ran
+        assert "Access-Control-Allow-Origin" not in response.headers
+
+    @pytest.mark.parametrize("path_info", ["*", "foo"])
+    def test_path_without_leading_slash_is_not_found(self, client, path_info):
+        """Test request targets like OPTIONS * get a JSON 404 instead of crashing"""
+        response = client.open("/", method="OPTIONS", environ_overrides={"PATH_INFO": path_info})
+        assert response.status_code == 404
+        assert response.get_json() == {"success": False, "error": "Resource not found"}
+
+    def test_unknown_api_path_uses_error_handler(self, client):
+        """Test unknown paths under a routed prefix still reach the 404 handler"""
+        response = client.get("/api/unknown")
+        assert response.status_code == 404
+        assert response.get_json()["success"] is False
+
+    def test_error_responses_do_not_share_headers(self, client):
+        """Test CORS headers from one error response don't leak into the next"""
+        first = client.get("/api/missing", headers={"Origin": "https://petchauisui.github.io"})
+        assert first.status_code == 404
+        assert first.headers.getlist("Access-Control-Allow-Origin") == ["https://petchauisui.github.io"]
+
+        second = client.get("/api/missing", headers={"Origin": "http://localhost:5000"})
+        assert second.status_code == 404
+        assert second.headers.getlist("Access-Control-Allow-Origin") == ["http://localhost:5000"]
+
+    def test_exception_handler(self):
         """Test generic exception handler"""
+        # ใช้แอปใหม่ เพราะแอปของ session รับ request ไปแล้วจึงเพิ่ม route ไม่ได้
+        app = create_app("testing")
+
         # 1. ปิด TESTING mode ชั่วคราว
         app.config["TESTING"] = False
 
@@ -338,6 +421,114 @@ class TestAppFactory:
         app.config["TESTING"] = True
 
 
+class TestRateLimit:
+    """Test rate limiting"""
+
+    @pytest.fixture
+    def limited_client(self, monkeypatch):
+        """Client for an app with rate limiting enabled"""
+        monkeypatch.setattr(TestingConfig, "RATELIMIT_ENABLED", True)
+        limited_app = create_app("testing")
+        with limited_app.app_context():
+            yield limited_app.test_client()
+            db.session.remove()
+            db.drop_all()
+
+    def test_rate_limit_exceeded(self, limited_client):
+        """Test requests over the hourly limit get a JSON 429"""
+        for _ in range(50):
+            assert limited_client.get("/api/todos").status_code == 200
+
+        response = limited_client.get("/api/todos")
+        assert response.status_code == 429
+        data = response.get_json()
+        assert data["success"] is False
+        assert "error" in data
+
+    @pytest.fixture
+    def proxied_client(self, monkeypatch):
+        """Client for a rate-limited app behind one reverse proxy"""
+        monkeypatch.setattr(TestingConfig, "PROXY_FIX_X_FOR", 1)
+        monkeypatch.setattr(TestingConfig, "RATELIMIT_ENABLED", True)
+        proxied_app = create_app("testing")
+        with proxied_app.app_context():
+            yield proxied_app.test_client()
+            db.session.remove()
+            db.drop_all()
+
+    def test_forwarded_clients_have_separate_limits(self, proxied_client):
+        """Test clients behind the proxy are keyed on their forwarded address"""
+        first = {"X-Forwarded-For": "203.0.113.1"}
+        second = {"X-Forwarded-For": "203.0.113.2"}
+        for _ in range(50):
+            assert proxied_client.get("/api/todos", headers=first).status_code == 200
+
+        assert proxied_client.get("/api/todos", headers=first).status_code == 429
+        assert proxied_client.get("/api/todos", headers=second).status_code == 200
+
+    def test_probe_paths_are_exempt(self, limited_client):
+        """Test health checks and the root endpoint are never limited"""
+        for _ in range(60):
+            assert limited_client.get("/api/health").status_code == 200
+            assert limited_client.get("/").status_code == 200
+
+
+class TestCompression:
+    """Test gzip compression of JSON responses"""
+
+    @pytest.fixture
+    def many_todos(self, app):
+        with app.app_context():
+            db.session.add_all([Todo(title=f"Todo {i}", description="x" * 50) for i in range(20)])
+            db.session.commit()
+
+    def test_large_list_is_gzipped(self, client, many_todos):
+        """Test large responses are compressed when the client accepts gzip"""
+        response = client.get("/api/todos", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert int(response.headers["Content-Length"]) == len(response.data)
+
+        data = json.loads(gzip.decompress(response.data))
+        assert data["count"] == 20
+
+    def test_not_gzipped_without_accept_encoding(self, client, many_todos):
+        """Test clients that don't accept gzip get the plain body"""
+        response = client.get("/api/todos")
+        assert "Content-Encoding" not in response.headers
+        assert response.get_json()["count"] == 20
+
+    def test_small_response_not_gzipped(self, client):
+        """Test responses below the size threshold are left alone"""
+        response = client.get("/api/todos", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+
+
+class TestJsonProvider:
+    """Test orjson-backed JSON provider"""
+
+    def test_app_uses_orjson_provider(self, app):
+        """Test app.json is the orjson provider"""
+        assert isinstance(app.json, OrjsonProvider)
+
+    def test_dumps_and_loads_round_trip(self, app):
+        """Test provider serializes non-native types and parses bytes"""
+        text = app.json.dumps({"price": Decimal("1.50"), 1: "one"})
+        assert app.json.loads(text.encode()) == {"price": "1.50", "1": "one"}
+
+    def test_dumps_unsupported_type(self, app):
+        """Test provider rejects objects it cannot serialize"""
+        with pytest.raises(TypeError):
+            app.json.dumps({"value": object()})
+
+    def test_invalid_json_body(self, client):
+        """Test malformed JSON is rejected instead of crashing the parser"""
+        res = client.post("/api/todos", data="{bad", content_type="application/json")
+        assert res.status_code in (400, 500)
+        assert res.get_json()["success"] is False
+
+
 class TestTodoModel:
     """Test Todo model methods"""
 
@@ -1,104 +1,163 @@
+import importlib.util
 import os
+from types import MappingProxyType
+
+import dotenv
 import pytest
+from sqlalchemy.pool import StaticPool
+
+from app import create_app as _create_app
+from app.config import Config, DevelopmentConfig, ProductionConfig, config
+
+# เทสต์ในไฟล์นี้แก้ os.environ จึงให้รันบน xdist worker เดียวกันทั้งหมด
+pytestmark = pytest.mark.xdist_group(name="env_mutating")
+
+_MISSING = object()
+
+
+def _fresh_config():
+    """โหลด app/config.py ใหม่อีกชุด ให้ class attribute อ่านค่า env ปัจจุบัน (ไม่แตะ app.config เดิม)"""
+    spec = importlib.util.spec_from_file_location("_fresh_config", importlib.util.find_spec("app.config").origin)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def fresh_config(monkeypatch):
+    """
+    ตัวโหลด app/config.py ชุดใหม่ที่ไม่อ่าน .env ซ้ำ
+    (load_dotenv จะเติมค่าที่เทสต์ลบไปกลับเข้า os.environ โดยที่ monkeypatch คืนค่าให้ไม่ได้)
+    """
+    monkeypatch.setattr(dotenv, "load_dotenv", lambda *args, **kwargs: False)
+    return _fresh_config
+
+
+# Base configuration
+def test_base_has_secret_and_no_track_mod(cfg_snapshot):
+    secret_key = getattr(Config, "SECRET_KEY", _MISSING)
+    assert secret_key is not _MISSING and secret_key is not None
+    assert cfg_snapshot.base["SQLALCHEMY_TRACK_MODIFICATIONS"] is False
 
-from app.config import (
-    Config,
-    DevelopmentConfig,
-    TestingConfig,
-    ProductionConfig,
-    config,
+
+def test_base_does_not_auto_create_tables(cfg_snapshot):
+    assert cfg_snapshot.base["AUTO_CREATE_TABLES"] is False
+
+
+def test_base_rate_limiting_is_opt_in(monkeypatch, fresh_config):
+    monkeypatch.delenv("RATELIMIT_ENABLED", raising=False)
+    assert fresh_config().Config.RATELIMIT_ENABLED is False
+
+    monkeypatch.setenv("RATELIMIT_ENABLED", "true")
+    assert fresh_config().Config.RATELIMIT_ENABLED is True
+
+
+def test_base_enables_pool_pre_ping(cfg_snapshot):
+    options = cfg_snapshot.base["SQLALCHEMY_ENGINE_OPTIONS"]
+    assert options["pool_pre_ping"] is True
+    assert options["pool_size"] > 0
+
+
+# Per-environment flags
+@pytest.mark.parametrize(
+    "env,attr,expected",
+    [
+        ("dev", "DEBUG", True),
+        ("test", "TESTING", True),
+        ("prod", "DEBUG", False),
+        ("test", "WTF_CSRF_ENABLED", False),
+    ],
 )
+def test_flag(cfg_snapshot, env, attr, expected):
+    assert getattr(cfg_snapshot, env)[attr] is expected
+
+
+# Development configuration
+def test_development_auto_creates_tables(cfg_snapshot):
+    assert cfg_snapshot.dev["AUTO_CREATE_TABLES"] is True
 
 
-class TestConfig:
-    """Base configuration"""
+def test_development_has_database_uri_default_or_env(monkeypatch, fresh_config):
+    # ไม่มี DATABASE_URL -> ควรมีค่า default ให้ใช้งานได้
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    uri = fresh_config().DevelopmentConfig.SQLALCHEMY_DATABASE_URI
+    assert uri == "postgresql://postgres:postgres@db:5432/todo_dev"
 
-    def test_base_has_secret_and_no_track_mod(self):
-        assert hasattr(Config, "SECRET_KEY")
-        assert Config.SECRET_KEY is not None
-        assert Config.SQLALCHEMY_TRACK_MODIFICATIONS is False
+    # มี DATABASE_URL -> อ่านค่าจาก env ตอนโหลด config
+    monkeypatch.setenv("DATABASE_URL", "postgresql://u:p@h:5432/dev_override")
+    uri = fresh_config().DevelopmentConfig.SQLALCHEMY_DATABASE_URI
+    assert uri == "postgresql://u:p@h:5432/dev_override"
 
 
-class TestDevelopmentConfig:
-    """Development configuration"""
+# Testing configuration
+def test_testing_uses_sqlite_memory(cfg_snapshot):
+    assert cfg_snapshot.test["SQLALCHEMY_DATABASE_URI"] == "sqlite:///:memory:"
 
-    def test_debug_enabled(self):
-        assert DevelopmentConfig.DEBUG is True
 
-    def test_has_database_uri_default_or_env(self, monkeypatch):
-        # ไม่มี DATABASE_URL -> ควรมีค่า default ให้ใช้งานได้
-        monkeypatch.delenv("DATABASE_URL", raising=False)
-        assert hasattr(DevelopmentConfig, "SQLALCHEMY_DATABASE_URI")
-        assert DevelopmentConfig.SQLALCHEMY_DATABASE_URI is not None
+def test_testing_uses_static_pool(cfg_snapshot):
+    assert cfg_snapshot.test["SQLALCHEMY_ENGINE_OPTIONS"]["poolclass"] is StaticPool
 
-        # มี DATABASE_URL -> รองรับการอ่านค่าจาก env
-        monkeypatch.setenv("DATABASE_URL", "postgresql://u:p@h:5432/dev_override")
-        assert "postgresql://" in os.environ["DATABASE_URL"]
 
+# Production configuration
+def test_production_query_tracking_disabled(cfg_snapshot):
+    assert cfg_snapshot.prod["SQLALCHEMY_TRACK_MODIFICATIONS"] is False
+    assert cfg_snapshot.prod["SQLALCHEMY_RECORD_QUERIES"] is False
 
-class TestTestingConfig:
-    """Testing configuration"""
 
-    def test_testing_enabled(self):
-        assert TestingConfig.TESTING is True
+def test_production_auto_creates_tables_unless_disabled(monkeypatch, fresh_config):
+    # ยังไม่มี migration -> deploy ใหม่ต้องสร้างตารางเองเป็นค่า default
+    monkeypatch.delenv("AUTO_CREATE_TABLES", raising=False)
+    assert fresh_config().ProductionConfig.AUTO_CREATE_TABLES is True
 
-    def test_uses_sqlite_memory(self):
-        assert "sqlite:///:memory:" in TestingConfig.SQLALCHEMY_DATABASE_URI
+    monkeypatch.setenv("AUTO_CREATE_TABLES", "false")
+    assert fresh_config().ProductionConfig.AUTO_CREATE_TABLES is False
 
-    def test_csrf_disabled(self):
-        assert TestingConfig.WTF_CSRF_ENABLED is False
 
+def test_production_validate_env_passes(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "postgresql://u:p@h:5432/prod_db")
+    ProductionConfig.validate_env()
 
-class TestProductionConfig:
-    """Production configuration"""
 
-    def test_debug_disabled(self):
-        assert ProductionConfig.DEBUG is False
+def test_production_requires_database_url(monkeypatch):
+    """
+    Production ต้องมี DATABASE_URL เสมอ (ตรวจใน validate_env ซึ่ง init_app เรียก)
+    """
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    with pytest.raises(AssertionError, match="DATABASE_URL"):
+        ProductionConfig.validate_env()
 
-    def test_requires_database_url(self, monkeypatch):
-        """
-        Production ต้องมี DATABASE_URL เสมอ (assert ใน init_app)
-        """
-        monkeypatch.delenv("DATABASE_URL", raising=False)
-        from app import create_app
 
-        with pytest.raises(AssertionError):
-            _ = create_app("production")
+def test_production_init_app_validates_env(monkeypatch):
+    """
+    init_app ต้องเรียก validate_env: ไม่มี DATABASE_URL แล้วสร้างแอป production ไม่ได้
+    """
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    with pytest.raises(AssertionError, match="DATABASE_URL"):
+        _create_app("production")
 
-    def test_init_app_passes_when_database_url_present(self, monkeypatch):
-        """
-        มี DATABASE_URL แล้วควรสร้างแอป production ได้
-        NOTE: เนื่องจาก ProductionConfig.SQLALCHEMY_DATABASE_URI ถูกกำหนดตอน import
-        เราจึง set ทั้ง env และ override แอตทริบิวต์บนคลาสก่อนเรียก create_app
-        """
-        # 1) ตั้ง env
-        monkeypatch.setenv("DATABASE_URL", "sqlite:///:memory:")
 
-        # 2) กันเคสที่คลาสถูกประเมินก่อน env: override ค่าในคลาสด้วย
-        monkeypatch.setattr(
-            ProductionConfig,
-            "SQLALCHEMY_DATABASE_URI",
-            "sqlite:///:memory:",
-            raising=False,
-        )
+def test_production_init_app_passes_when_database_url_present(production_app):
+    """
+    มี DATABASE_URL แล้วควรสร้างแอป production ได้
+    (DEBUG ตรวจจาก ProductionConfig โดยตรงใน test_flag ไม่ต้องพึ่งแอป)
+    """
+    assert production_app is not None
+    assert production_app.config["SQLALCHEMY_DATABASE_URI"] == "postgresql+psycopg2://test"
 
-        # 3) ค่อยสร้างแอป
-        from app import create_app
 
-        app = create_app("production")
-        assert app is not None
-        assert app.config["DEBUG"] is False
-        assert app.config["SQLALCHEMY_DATABASE_URI"] == "sqlite:///:memory:"
+def test_production_app_does_not_leak_patches(production_app):
+    # production_app ต้องคืน env และ ProductionConfig หลังสร้างแอปเสร็จ
+    assert production_app.config["SQLALCHEMY_DATABASE_URI"] == "postgresql+psycopg2://test"
+    assert os.getenv("DATABASE_URL") != "postgresql+psycopg2://test"
+    assert ProductionConfig.SQLALCHEMY_DATABASE_URI != "postgresql+psycopg2://test"
 
 
 class TestConfigSelector:
     """Selector mapping"""
 
     def test_config_contains_all_environments(self):
-        assert "development" in config
-        assert "testing" in config
-        assert "production" in config
-        assert "default" in config
+        assert isinstance(config, MappingProxyType)
+        assert config.keys() >= {"development", "testing", "production", "default"}
 
     def test_default_is_development(self):
         assert config["default"] == DevelopmentConfig